@@ -5,6 +5,7 @@ EntropySeed interactive simulator:
 - Capture button to snapshot, feed screenshot to OpenCV
 - Extract centroids -> create entropy pool -> derive 256-bit key (SHA-256)
 - Prompt user phrase -> hash it (SHA-256) -> encrypt with AES-GCM using derived key
+  (ChaCha20-Poly1305 on CPUs without AES-NI/PCLMUL)
 - Show hashed phrase, ciphertext, key; allow decrypt button to verify
 """
 
@@ -14,12 +15,18 @@ import time
 import math
 import base64
 import hashlib
-import random
 import threading
 
 import numpy as np
 import cv2
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+
+# Numba JIT for the particle step (optional, falls back to NumPy)
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
 # Try to start virtual display if headless (optional)
 try:
@@ -45,6 +52,9 @@ BIG = pygame.font.SysFont("Consolas", 28)
 # Simulation params
 FPS = 60
 BACKGROUND = (10, 10, 20)
+rng = np.random.default_rng()
+WH = np.array([W, H], dtype=np.float32)
+SAVE_SCREENSHOT = False  # debug: also write each capture to screenshot.png
 
 # UI elements
 def draw_button(surf, rect, text, active=True):
@@ -56,6 +66,12 @@ def draw_button(surf, rect, text, active=True):
 def draw_text(surf, pos, text, color=(220,220,220), font=FONT):
     surf.blit(font.render(text, True, color), pos)
 
+# Rotation lookup table for star outlines (theta quantized to 256 bins)
+ANGLE_BINS = 256
+_COS_LUT = np.cos(np.arange(ANGLE_BINS) * 2*math.pi/ANGLE_BINS).astype(np.float32)
+_SIN_LUT = np.sin(np.arange(ANGLE_BINS) * 2*math.pi/ANGLE_BINS).astype(np.float32)
+STAR_ROTATIONS = 32  # pre-rendered star sprites per type (atlas)
+
 # Microorganism class
 class MicroType:
     def __init__(self, kind_id, shape, color, size, v_mean, tumble_rate, D_t, D_r):
@@ -67,64 +83,141 @@ class MicroType:
         self.tumble_rate = tumble_rate
         self.D_t = D_t
         self.D_r = D_r
+        # star outline at angle 0 (pixel offsets), rotated via LUT
+        s = int(size)
+        self.half = s
+        self.star_unit = np.array([(math.cos(i*2*math.pi/5) * (s if i%2==0 else int(s*0.5)),
+                                    math.sin(i*2*math.pi/5) * (s if i%2==0 else int(s*0.5)))
+                                   for i in range(5)], dtype=np.float32)
+        # pre-rendered shape sprites centred at (s, s); stars get one per
+        # rotation bin, other shapes a single sprite
+        if shape == 'star':
+            step = ANGLE_BINS // STAR_ROTATIONS
+            self.sprites = [self._render_star(s, k*step) for k in range(STAR_ROTATIONS)]
+        else:
+            self.sprites = [self._render_shape(s)]
+        # pre-rendered glow, blitted as-is for every particle of this type
+        self.glow_surf = pygame.Surface((s*3, s*3), pygame.SRCALPHA)
+        pygame.draw.circle(self.glow_surf, (*color, 30), (s*1, s*1), s+4)
+
+    def _render_shape(self, s):
+        spr = pygame.Surface((2*s+1, 2*s+1), pygame.SRCALPHA)
+        if self.shape == 'circle':
+            pygame.draw.circle(spr, self.color, (s,s), s)
+        elif self.shape == 'rect':
+            pygame.draw.rect(spr, self.color, (0, 0, 2*s, 2*s))
+        elif self.shape == 'triangle':
+            pygame.draw.polygon(spr, self.color, [(s, 0), (0, 2*s), (2*s, 2*s)])
+        return spr
+
+    def _render_star(self, s, ti):
+        # simple star-like 5-point, rotated by LUT bin ti
+        spr = pygame.Surface((2*s+1, 2*s+1), pygame.SRCALPHA)
+        c, sn = _COS_LUT[ti], _SIN_LUT[ti]
+        rot = np.array([[c, sn], [-sn, c]], dtype=np.float32)
+        pts = (self.star_unit @ rot).astype(np.int32) + s
+        pygame.draw.polygon(spr, self.color, pts.tolist())
+        return spr
+
+if HAVE_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def step_kernel(pos, theta, v0, kind, tumble_rate, D_t, D_r,
+                    rand_u, rand_th, rand_n_xy, rand_n_th, dt, W, H):
+        # fused run-and-tumble update, one pass over all particles
+        for i in prange(pos.shape[0]):
+            k = kind[i]
+            if rand_u[i] < tumble_rate[k] * dt:
+                theta[i] = rand_th[i]
+            st = math.sqrt(2*D_t[k]*dt)
+            pos[i, 0] += math.cos(theta[i]) * v0[i] * dt + st * rand_n_xy[i, 0]
+            pos[i, 1] += math.sin(theta[i]) * v0[i] * dt + st * rand_n_xy[i, 1]
+            theta[i] += math.sqrt(2*D_r[k]*dt) * rand_n_th[i]
+            # wrap around screen (per-step motion is << W, H, so one
+            # compare-and-shift replaces the divide)
+            if pos[i, 0] < 0: pos[i, 0] += W
+            if pos[i, 0] >= W: pos[i, 0] -= W
+            if pos[i, 1] < 0: pos[i, 1] += H
+            if pos[i, 1] >= H: pos[i, 1] -= H
+
+class Particles:
+    """All microbes stored as struct-of-arrays; one row per particle."""
+    def __init__(self, types, per_type):
+        self.types = types
+        self.kind = np.repeat(np.arange(len(types), dtype=np.int32), per_type)
+        n = len(self.kind)
+        self.pos = np.column_stack([rng.uniform(0, W, n), rng.uniform(0, H, n)]).astype(np.float32)
+        self.theta = rng.uniform(0, 2*math.pi, n)
+        # per-type parameters, indexed by kind
+        v_mean = np.array([t.v_mean for t in types])
+        self.tumble_rate = np.array([t.tumble_rate for t in types])
+        self.D_t = np.array([t.D_t for t in types])
+        self.D_r = np.array([t.D_r for t in types])
+        vm = v_mean[self.kind]
+        self.v0 = np.maximum(1.0, rng.normal(vm, np.maximum(1.0, 0.2*vm)))
+        # per-particle draw lookups (sprite offset, star flag)
+        self.half = np.array([t.half for t in types], dtype=np.int32)[self.kind]
+        self.is_star = np.array([t.shape == 'star' for t in types])[self.kind]
+        self.kind_list = self.kind.tolist()
+        if HAVE_NUMBA:
+            # compile the kernel now (zero-length call with the real dtypes)
+            # so the first frame doesn't stall on JIT
+            step_kernel(self.pos[:0], self.theta[:0], self.v0[:0], self.kind[:0],
+                        self.tumble_rate, self.D_t, self.D_r,
+                        np.empty(0), np.empty(0), np.empty((0, 2)), np.empty(0),
+                        0.0, W, H)
 
-class Micro:
-    def __init__(self, mtype: MicroType):
-        self.type = mtype
-        self.pos = np.array([random.uniform(0, W), random.uniform(0, H)])
-        self.theta = random.uniform(0, 2*math.pi)
-        self.v0 = max(1.0, random.gauss(self.type.v_mean, max(1.0, 0.2*self.type.v_mean)))
-    def step(self, dt):
+    def __len__(self):
+        return len(self.kind)
+
+    def step_all(self, dt):
+        n = len(self.kind)
+        if HAVE_NUMBA:
+            step_kernel(self.pos, self.theta, self.v0, self.kind,
+                        self.tumble_rate, self.D_t, self.D_r,
+                        rng.random(n), rng.uniform(0, 2*math.pi, n),
+                        rng.standard_normal((n, 2)), rng.standard_normal(n),
+                        dt, W, H)
+            return
         # run-and-tumble
-        if random.random() < (self.type.tumble_rate * dt):
-            self.theta = random.uniform(0, 2*math.pi)
-        v = np.array([math.cos(self.theta), math.sin(self.theta)]) * self.v0 * dt
-        noise = np.sqrt(2*self.type.D_t*dt) * np.random.randn(2)
+        tumble = rng.random(n) < self.tumble_rate[self.kind] * dt
+        self.theta[tumble] = rng.uniform(0, 2*math.pi, int(tumble.sum()))
+        v = np.stack([np.cos(self.theta), np.sin(self.theta)], 1) * (self.v0 * dt)[:, None]
+        noise = np.sqrt(2*self.D_t[self.kind]*dt)[:, None] * rng.standard_normal((n, 2))
         self.pos += v + noise
         # rotational diffusion
-        self.theta += np.sqrt(2*self.type.D_r*dt) * np.random.randn()
-        # wrap around screen
-        self.pos[0] = self.pos[0] % W
-        self.pos[1] = self.pos[1] % H
+        self.theta += np.sqrt(2*self.D_r[self.kind]*dt) * rng.standard_normal(n)
+        # wrap around screen (branchless compare-and-shift, no divide)
+        self.pos += WH * (self.pos < 0)
+        self.pos -= WH * (self.pos >= WH)
 
     def draw(self, surf):
-        x, y = int(self.pos[0]), int(self.pos[1])
-        s = int(self.type.size)
-        col = self.type.color
-        if self.type.shape == 'circle':
-            pygame.draw.circle(surf, col, (x,y), s)
-        elif self.type.shape == 'rect':
-            pygame.draw.rect(surf, col, (x-s, y-s, 2*s, 2*s))
-        elif self.type.shape == 'triangle':
-            pts = [(x, y-s), (x-s, y+s), (x+s, y+s)]
-            pygame.draw.polygon(surf, col, pts)
-        elif self.type.shape == 'star':
-            # simple star-like 5-point
-            pts = []
-            for i in range(5):
-                a = self.theta + i * 2*math.pi/5
-                r = s if i%2==0 else int(s*0.5)
-                pts.append((x + int(math.cos(a)*r), y + int(math.sin(a)*r)))
-            pygame.draw.polygon(surf, col, pts)
-        # small glow
-        glow = pygame.Surface((s*3, s*3), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (*col, 30), (s*1, s*1), s+4)
-        surf.blit(glow, (x-s, y-s), special_flags=pygame.BLEND_RGBA_ADD)
+        # top-left corner of each particle's sprite/glow
+        dests = (self.pos.astype(np.int32) - self.half[:, None]).tolist()
+        # star rotation: LUT bin -> atlas slot; other shapes use sprite 0
+        ti = (self.theta * (ANGLE_BINS/(2*math.pi))).astype(np.int64) & (ANGLE_BINS-1)
+        slot = np.where(self.is_star, ti // (ANGLE_BINS // STAR_ROTATIONS), 0).tolist()
+        types = self.types
+        surf.blits([(types[k].sprites[r], d) for k, r, d in zip(self.kind_list, slot, dests)],
+                   doreturn=False)
+        # small glow, additive on top of all shapes
+        surf.blits([(types[k].glow_surf, d, None, pygame.BLEND_RGBA_ADD)
+                    for k, d in zip(self.kind_list, dests)], doreturn=False)
 
 # Helpers to create types
 def make_types(count_types):
     shapes = ['circle','rect','triangle','star']
-    types = []
-    for i in range(count_types):
-        shape = shapes[i % len(shapes)]
-        color = tuple(np.random.randint(50,230,3).tolist())
-        size = random.uniform(3 + i*0.3, 8 + i*0.6)
-        v_mean = random.uniform(10 + i*3, 80 + i*5)
-        tumble_rate = random.uniform(0.02, 0.3)
-        D_t = random.uniform(0.1, 1.2)
-        D_r = random.uniform(0.05, 0.8)
-        types.append(MicroType(i, shape, color, size, v_mean, tumble_rate, D_t, D_r))
-    return types
+    n = count_types
+    i = np.arange(n)
+    # draw every per-type parameter in one batch
+    colors = rng.integers(50, 230, (n, 3)).tolist()
+    sizes = rng.uniform(3 + i*0.3, 8 + i*0.6).tolist()
+    v_means = rng.uniform(10 + i*3, 80 + i*5).tolist()
+    tumble_rates = rng.uniform(0.02, 0.3, n).tolist()
+    D_ts = rng.uniform(0.1, 1.2, n).tolist()
+    D_rs = rng.uniform(0.05, 0.8, n).tolist()
+    return [MicroType(k, shapes[k % len(shapes)], tuple(col), size, v_mean, tumble_rate, D_t, D_r)
+            for k, (col, size, v_mean, tumble_rate, D_t, D_r)
+            in enumerate(zip(colors, sizes, v_means, tumble_rates, D_ts, D_rs))]
 
 # Build initial UI state
 input_active = True
@@ -132,7 +225,7 @@ typed_text = ""
 state = "ask_count"  # ask_count -> running -> captured -> phrase_input -> done
 count_types = None
 micro_types = []
-microbes = []
+microbes = None
 
 # UI rects
 capture_rect = pygame.Rect(W-180, H-70, 160, 44)
@@ -140,6 +233,8 @@ decrypt_rect = pygame.Rect(W-360, H-70, 160, 44)
 
 # Crypto storage
 derived_key = None
+aead_alg = None  # algorithm tag of aead_ctx
+aead_ctx = None  # cipher bound to derived_key, rebuilt on each capture
 ciphertext_b64 = None
 nonce = None
 plaintext_hash_hex = None
@@ -147,57 +242,89 @@ raw_pool_sample = None
 
 clock = pygame.time.Clock()
 
+# OpenCV capture pipeline: structuring element and per-stage image buffers
+# are built once and reused across captures
+_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5,5))
+_cv_bufs = None
+
+def _capture_buffers(shape):
+    global _cv_bufs
+    if _cv_bufs is None or _cv_bufs[0].shape != shape:
+        half = (shape[0]//2, shape[1]//2)
+        # gray, half-res gray, half-res mask, full-res mask
+        _cv_bufs = (np.empty(shape, dtype=np.uint8), np.empty(half, dtype=np.uint8),
+                    np.empty(half, dtype=np.uint8), np.empty(shape, dtype=np.uint8))
+    return _cv_bufs
+
 def take_screenshot_and_process():
-    global derived_key, ciphertext_b64, plaintext_hash_hex, nonce, raw_pool_sample
-    # save screenshot
-    fn = "screenshot.png"
-    pygame.image.save(screen, fn)
-    img = cv2.imread(fn)
-    if img is None:
-        print("Failed to read screenshot")
-        return
-    # simple blob detection: convert to gray, blur, adaptive threshold
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    blur = cv2.GaussianBlur(gray, (7,7), 1.5)
-    _, th = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    # morphological cleanup
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5,5))
-    th = cv2.morphologyEx(th, cv2.MORPH_OPEN, kernel)
-    cnts, _ = cv2.findContours(th, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    features = []
-    for c in cnts:
-        area = cv2.contourArea(c)
-        if area < 20: continue
-        M = cv2.moments(c)
-        if M["m00"] == 0: continue
-        cx = int(M["m10"] / M["m00"])
-        cy = int(M["m01"] / M["m00"])
-        features.append((cx, cy, int(area)))
-    # sort and keep top N
-    features = sorted(features, key=lambda x: x[2], reverse=True)[:128]
-    vec = np.zeros(128*3, dtype=np.int32)
-    for i,f in enumerate(features):
-        vec[i*3+0] = f[0]
-        vec[i*3+1] = f[1]
-        vec[i*3+2] = f[2]
-    pool = vec.tobytes()
+    global derived_key, aead_alg, aead_ctx, ciphertext_b64, plaintext_hash_hex, nonce, raw_pool_sample
+    # grab pixels straight from the display surface (no PNG round-trip)
+    if SAVE_SCREENSHOT:
+        pygame.image.save(screen, "screenshot.png")
+    rgb = pygame.surfarray.pixels3d(screen)
+    img = cv2.cvtColor(rgb.swapaxes(0, 1), cv2.COLOR_RGB2BGR)
+    del rgb  # release the surface lock
+    # simple blob detection: convert to gray, Otsu threshold at half resolution
+    h, w = img.shape[:2]
+    gray, small, small_th, th = _capture_buffers((h, w))
+    cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=gray)
+    # 2x2 area downsample smooths like the old 7x7 blur at a quarter the pixels
+    cv2.resize(gray, (w//2, h//2), dst=small, interpolation=cv2.INTER_AREA)
+    cv2.threshold(small, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=small_th)
+    cv2.resize(small_th, (w, h), dst=th, interpolation=cv2.INTER_NEAREST)
+    # morphological cleanup (in place)
+    cv2.morphologyEx(th, cv2.MORPH_OPEN, _KERNEL, dst=th)
+    # centroid + area of every blob in one labelling pass (label 0 is background)
+    _, _, stats, cents = cv2.connectedComponentsWithStats(th, connectivity=8)
+    areas = stats[1:, cv2.CC_STAT_AREA].astype(np.int32)
+    keep = areas >= 20
+    cx = cents[1:, 0][keep].astype(np.int32)
+    cy = cents[1:, 1][keep].astype(np.int32)
+    areas = areas[keep]
+    # keep top N by area; stable sort so tied areas keep label order
+    idx = np.argsort(-areas, kind="stable")[:128]
+    k = len(idx)
+    vec = np.zeros((128, 3), dtype=np.int32)
+    vec[:k] = np.stack([cx[idx], cy[idx], areas[idx]], axis=1)
+    pool_parts = [vec.tobytes()]
     # add pixel-level randomness: sample random patches' intensity
-    h, w = gray.shape
-    for _ in range(64):
-        x = random.randint(0, w-1)
-        y = random.randint(0, h-1)
-        pool += bytes([int(gray[y,x])])
+    ys = rng.integers(0, h, 64)
+    xs = rng.integers(0, w, 64)
+    samples = gray[ys, xs].astype(np.uint8).tobytes()
     # add OS entropy defense-in-depth
-    pool += os.urandom(32)
+    # join once so the pool is a single contiguous buffer for hashing
+    pool = b"".join(pool_parts + [samples, os.urandom(32)])
     raw_pool_sample = pool[:2048]
-    # derive 256-bit key using SHA-256
+    # derive 256-bit key using SHA-256 (one call over the whole pool)
     k = hashlib.sha256(pool).digest()  # 32 bytes
     derived_key = k
+    aead_alg = _pick_aead_alg()
+    aead_ctx = _AEADS[aead_alg](derived_key)
     # save pool sample for audit
     with open("entropy_pool.bin", "wb") as f:
         f.write(raw_pool_sample)
     print("Derived key (hex):", k.hex())
 
+# ciphertext layout: 1-byte algorithm tag || 12-byte nonce || ct+tag
+_AEADS = {0: AESGCM, 1: ChaCha20Poly1305}
+AEAD_ALG = None  # chosen on first capture by _pick_aead_alg()
+
+def _pick_aead_alg():
+    # AES-GCM only with accelerated AES and carry-less multiply (GHASH),
+    # else constant-time ChaCha20-Poly1305. py-cpuinfo is optional and slow
+    # (~1 s, probes in a child process), so probe once and cache the result
+    global AEAD_ALG
+    if AEAD_ALG is None:
+        try:
+            import cpuinfo
+            flags = cpuinfo.get_cpu_info().get("flags", [])
+            # x86: pclmulqdq, ARM: pmull
+            has_clmul = "pclmulqdq" in flags or "pmull" in flags
+            AEAD_ALG = 0 if ("aes" in flags and has_clmul) else 1
+        except Exception:
+            AEAD_ALG = 0  # cpuinfo unavailable: keep AES-GCM
+    return AEAD_ALG
+
 def encrypt_phrase(phrase):
     global ciphertext_b64, plaintext_hash_hex, nonce
     if derived_key is None:
@@ -205,21 +332,21 @@ def encrypt_phrase(phrase):
     # hash the phrase (sha256)
     ph = phrase.encode("utf-8")
     plaintext_hash_hex = hashlib.sha256(ph).hexdigest()
-    aesgcm = AESGCM(derived_key)
     nonce = os.urandom(12)
-    ct = aesgcm.encrypt(nonce, ph, None)
-    ciphertext_b64 = base64.b64encode(nonce + ct).decode("ascii")
+    ct = aead_ctx.encrypt(nonce, ph, None)
+    ciphertext_b64 = base64.b64encode(bytes([aead_alg]) + nonce + ct).decode("ascii")
 
 def decrypt_ciphertext():
     global ciphertext_b64
     if ciphertext_b64 is None or derived_key is None:
         return None
     raw = base64.b64decode(ciphertext_b64)
-    nonce = raw[:12]
-    ct = raw[12:]
-    aesgcm = AESGCM(derived_key)
+    if raw[0] != aead_alg:
+        return None
+    nonce = raw[1:13]
+    ct = raw[13:]
     try:
-        pt = aesgcm.decrypt(nonce, ct, None)
+        pt = aead_ctx.decrypt(nonce, ct, None)
         return pt.decode("utf-8")
     except Exception as e:
         return None
@@ -253,10 +380,7 @@ while running:
                         # build types and microbes
                         micro_types = make_types(count_types)
                         # spawn microbes: 40 per type (tunable)
-                        microbes = []
-                        for t in micro_types:
-                            for _ in range(40):
-                                microbes.append(Micro(t))
+                        microbes = Particles(micro_types, 40)
                         state = "running"
                         typed_text = ""
                         print(f"Spawning {count_types} types, total microbes: {len(microbes)}")
@@ -306,11 +430,8 @@ while running:
             draw_text(screen, (30, y + i*26), l, color=(160,160,180))
     else:
         # simulate steps
-        for m in microbes:
-            m.step(dt)
-        # optionally shuffle draw order
-        for m in microbes:
-            m.draw(screen)
+        microbes.step_all(dt)
+        microbes.draw(screen)
         # left panel info
         info_x = 20
         info_y = H - 160
@@ -140,6 +140,7 @@ decrypt_rect = pygame.Rect(W-360, H-70, 160, 44)
 
 # Crypto storage
 derived_key = None
+aesgcm_ctx = None  # AESGCM bound to derived_key, rebuilt on each capture
 ciphertext_b64 = None
 nonce = None
 plaintext_hash_hex = None
@@ -148,7 +149,7 @@ raw_pool_sample = None
 clock = pygame.time.Clock()
 
 def take_screenshot_and_process():
-    global derived_key, ciphertext_b64, plaintext_hash_hex, nonce, raw_pool_sample
+    global derived_key, aesgcm_ctx, ciphertext_b64, plaintext_hash_hex, nonce, raw_pool_sample
     # save screenshot
     fn = "screenshot.png"
     pygame.image.save(screen, fn)
@@ -193,6 +194,7 @@ def take_screenshot_and_process():
     # derive 256-bit key using SHA-256
     k = hashlib.sha256(pool).digest()  # 32 bytes
     derived_key = k
+    aesgcm_ctx = AESGCM(derived_key)
     # save pool sample for audit
     with open("entropy_pool.bin", "wb") as f:
         f.write(raw_pool_sample)
@@ -205,21 +207,23 @@ def encrypt_phrase(phrase):
     # hash the phrase (sha256)
     ph = phrase.encode("utf-8")
     plaintext_hash_hex = hashlib.sha256(ph).hexdigest()
-    aesgcm = AESGCM(derived_key)
     nonce = os.urandom(12)
-    ct = aesgcm.encrypt(nonce, ph, None)
-    ciphertext_b64 = base64.b64encode(nonce + ct).decode("ascii")
+    ct = aesgcm_ctx.encrypt(nonce, ph, None)
+    # pack nonce || ct into one preallocated buffer, no intermediate concat
+    buf = bytearray(12 + len(ct))
+    buf[:12] = nonce
+    buf[12:] = ct
+    ciphertext_b64 = base64.b64encode(buf).decode("ascii")
 
 def decrypt_ciphertext():
     global ciphertext_b64
     if ciphertext_b64 is None or derived_key is None:
         return None
-    raw = base64.b64decode(ciphertext_b64)
+    raw = memoryview(base64.b64decode(ciphertext_b64))  # zero-copy slices
     nonce = raw[:12]
     ct = raw[12:]
-    aesgcm = AESGCM(derived_key)
     try:
-        pt = aesgcm.decrypt(nonce, ct, None)
+        pt = aesgcm_ctx.decrypt(nonce, ct, None)
         return pt.decode("utf-8")
     except Exception as e:
         return None